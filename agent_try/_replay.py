@@ -0,0 +1,116 @@
+"""
+Record-and-replay of agent responses for deterministic test runs.
+
+Set ``AGENT_RECORD=1`` to save every non-empty response to a JSON cassette
+keyed by a hash of the query, and ``AGENT_REPLAY=1`` to answer queries found
+in the cassette without contacting the model. Both are read once, on the
+first wrapped call. The cassette path defaults to
+``agent_try/tests/cassettes/agent_responses.json`` and can be overridden with
+``AGENT_CASSETTE``.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Collection, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_CASSETTE = Path(__file__).parent / "tests" / "cassettes" / "agent_responses.json"
+
+
+def _enabled(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
+@functools.cache
+def _replay_mode() -> Tuple[bool, bool]:
+    """Return the (replay, record) flags; call cache_clear() after changing them."""
+    return _enabled("AGENT_REPLAY"), _enabled("AGENT_RECORD")
+
+
+def _cassette_path() -> Path:
+    return Path(os.getenv("AGENT_CASSETTE", _DEFAULT_CASSETTE))
+
+
+def cassette_key(query: str) -> bytes:
+    """Hash a query into its cassette key."""
+    return hashlib.blake2b(query.encode("utf-8"), digest_size=16).digest()
+
+
+def load_cassette(path: Path) -> Dict[bytes, str]:
+    """
+    Load recorded responses from a cassette file.
+
+    Args:
+        path: Cassette file to read
+
+    Returns:
+        Mapping of cassette key to response; empty if the file doesn't exist
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {bytes.fromhex(key): response for key, response in entries.items()}
+
+
+def save_cassette(path: Path, cassette: Dict[bytes, str]) -> None:
+    """Write a cassette file, creating its directory if needed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {key.hex(): response for key, response in sorted(cassette.items())},
+            f, indent=2, ensure_ascii=False
+        )
+
+
+@functools.cache
+def _get_cassette(path: Path) -> Dict[bytes, str]:
+    """Load a cassette once per process; recordings update it in place."""
+    return load_cassette(path)
+
+
+def replayable(
+    func: Optional[Callable[..., Awaitable[str]]] = None,
+    *,
+    skip: Collection[str] = ()
+) -> Any:
+    """
+    Serve a query coroutine function from the cassette when replay is enabled.
+
+    The wrapped function must take the query as its first argument. Empty
+    responses and any listed in ``skip`` (e.g. fallback messages) are never
+    recorded, so a failed run can't be replayed as an answer. Use as
+    ``@replayable`` or ``@replayable(skip=...)``.
+    """
+    if func is None:
+        return functools.partial(replayable, skip=skip)
+
+    @functools.wraps(func)
+    async def wrapper(query: str, *args: Any, **kwargs: Any) -> str:
+        replay, record = _replay_mode()
+        if not (replay or record):
+            return await func(query, *args, **kwargs)
+
+        path = _cassette_path()
+        cassette = _get_cassette(path)
+        key = cassette_key(query)
+
+        if replay and key in cassette:
+            return cassette[key]
+        if replay:
+            logger.debug("No recorded response for query; calling the agent")
+
+        response = await func(query, *args, **kwargs)
+
+        if record and response.strip() and response not in skip:
+            cassette[key] = response
+            save_cassette(path, cassette)
+        return response
+
+    return wrapper
@@ -7,17 +7,19 @@ features like batch processing, performance tracking, and error handling.
 
 import asyncio
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Sequence, Tuple, Union
 from datetime import datetime
-import json
 import logging
 from dataclasses import dataclass
 from google.genai import types
 
-from agent_try.agent import get_agent_response, session_manager
+try:
+    import orjson
+except ImportError:  # Optional speedup; falls back to the stdlib json module
+    orjson = None
+
+from agent_try.agent import _configure_logging, get_agent_response, get_session_manager
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -46,6 +48,7 @@ class AgentRunner:
     """
     
     def __init__(self, agent_name: str = "professional_ai_agent"):
+        _configure_logging()
         self.agent_name = agent_name
         self.session_service = None
         self.runner = None
@@ -57,10 +60,18 @@ class AgentRunner:
         }
         
     async def initialize(self) -> bool:
+        """
+        Attach to the shared session manager and warm the default session.
+        
+        Creating the default session here moves its setup cost out of the
+        first query and into start-up.
+        
+        Returns:
+            bool: True if the agent is ready to serve queries
+        """
         try:
             # Use the global session_manager instead of creating our own
-            from agent_try.agent import session_manager
-            self.session_manager = session_manager
+            self.session_manager = get_session_manager()
         
             # Test that we can create a session
             session, runner = await self.session_manager.get_session_and_runner()
@@ -86,7 +97,9 @@ class AgentRunner:
         Returns:
             Structured AgentResponse object
         """
-        start_time = time.time()
+        # Monotonic clock for elapsed time; wall-clock timestamp taken once
+        start_time = time.perf_counter()
+        timestamp = datetime.now()
         
         for attempt in range(max_retries + 1):
             try:
@@ -95,7 +108,7 @@ class AgentRunner:
                 # Get agent response using the helper function
                 response_text = await get_agent_response(query)
                 
-                end_time = time.time()
+                end_time = time.perf_counter()
                 processing_time = end_time - start_time
                 
                 # Validate response
@@ -110,7 +123,7 @@ class AgentRunner:
                     query=query,
                     response=response_text,
                     processing_time=processing_time,
-                    timestamp=datetime.now(),
+                    timestamp=timestamp,
                     success=True,
                     metadata={
                         "query_id": query_id,
@@ -123,7 +136,7 @@ class AgentRunner:
                 logger.warning(f"Attempt {attempt + 1} failed for query {query_id}: {e}")
                 
                 if attempt == max_retries:
-                    end_time = time.time()
+                    end_time = time.perf_counter()
                     processing_time = end_time - start_time
                     
                     self.metrics["total_queries"] += 1
@@ -133,7 +146,7 @@ class AgentRunner:
                         query=query,
                         response="",
                         processing_time=processing_time,
-                        timestamp=datetime.now(),
+                        timestamp=timestamp,
                         success=False,
                         error=str(e),
                         metadata={
@@ -145,43 +158,41 @@ class AgentRunner:
                 # Wait before retry
                 await asyncio.sleep(1)
     
-    async def run_batch_queries(self, queries: List[str], 
-                              batch_size: int = 5) -> List[AgentResponse]:
+    async def _run_with_sem(self, sem: asyncio.Semaphore, query: str,
+                            query_id: int) -> AgentResponse:
+        """Run a single query once a concurrency slot is available."""
+        async with sem:
+            return await self.run_query(query, query_id=query_id)
+    
+    async def run_batch_queries(self, queries: Sequence[str], 
+                              batch_size: int = 8) -> List[AgentResponse]:
         """
-        Run multiple queries in controlled batches.
+        Run multiple queries concurrently with bounded concurrency.
+        
+        A single semaphore is shared by all queries, so a new query starts as
+        soon as any in-flight one finishes instead of waiting for a whole wave.
+        Per-query retries in ``run_query`` are the only throttle on overload.
         
         Args:
             queries: List of queries to process
-            batch_size: Number of queries to process concurrently
+            batch_size: Maximum number of queries in flight at once
             
         Returns:
-            List of AgentResponse objects
+            List of AgentResponse objects in input order
         """
-        logger.info(f"Starting batch processing of {len(queries)} queries")
+        logger.info(f"Starting batch processing of {len(queries)} queries "
+                    f"(concurrency: {batch_size})")
         
-        results = []
-        total_start_time = time.time()
+        total_start_time = time.perf_counter()
         
-        # Process in batches to avoid overwhelming the API
-        for i in range(0, len(queries), batch_size):
-            batch = queries[i:i + batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}/{(len(queries)-1)//batch_size + 1}")
-            
-            batch_tasks = []
-            for j, query in enumerate(batch, 1):
-                query_id = i + j
-                task = self.run_query(query, query_id=query_id)
-                batch_tasks.append(task)
-            
-            # Process batch concurrently
-            batch_results = await asyncio.gather(*batch_tasks)
-            results.extend(batch_results)
-            
-            # Small delay between batches
-            if i + batch_size < len(queries):
-                await asyncio.sleep(2)
+        sem = asyncio.Semaphore(batch_size)
+        tasks = [
+            self._run_with_sem(sem, query, query_id)
+            for query_id, query in enumerate(queries, 1)
+        ]
+        results = await asyncio.gather(*tasks)
         
-        total_end_time = time.time()
+        total_end_time = time.perf_counter()
         total_time = total_end_time - total_start_time
         
         self._print_batch_summary(results, total_time)
@@ -218,53 +229,115 @@ class AgentRunner:
             )
         return metrics
     
+    @staticmethod
+    def _result_record(result: Union[AgentResponse, Dict[str, Any]]) -> Dict[str, Any]:
+        """Convert a result into the dict written to result files."""
+        if isinstance(result, dict):
+            return result
+        return {
+            "query": result.query,
+            "response": result.response,
+            "processing_time": result.processing_time,
+            "success": result.success,
+            "error": result.error,
+            "metadata": result.metadata
+        }
+    
     def save_results_to_file(self, results: List[AgentResponse], filename: str = "agent_results.json"):
         """Save results to a JSON file for analysis."""
         output_data = {
             "timestamp": datetime.now().isoformat(),
             "metrics": self.get_performance_metrics(),
-            "results": [
-                {
-                    "query": r.query,
-                    "response": r.response,
-                    "processing_time": r.processing_time,
-                    "success": r.success,
-                    "error": r.error,
-                    "metadata": r.metadata
-                }
-                for r in results
-            ]
+            "results": [self._result_record(r) for r in results]
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False, default=str)
+        if orjson is not None:
+            # Pass datetimes through to default=str so output matches the json path
+            payload = orjson.dumps(
+                output_data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME,
+                default=str
+            )
+            with open(filename, 'wb') as f:
+                f.write(payload)
+        else:
+            import json
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(output_data, f, indent=2, ensure_ascii=False, default=str)
         
         logger.info(f"Results saved to {filename}")
+    
+    async def stream_results_to_file(
+        self,
+        results: AsyncIterator[Union[AgentResponse, Dict[str, Any]]],
+        filename: str = "agent_results.ndjson"
+    ) -> int:
+        """
+        Write results to a newline-delimited JSON file as they arrive.
+        
+        Each result is written as soon as it is produced, so memory stays flat
+        and file output overlaps with queries still in flight.
+        
+        Args:
+            results: Async iterator of AgentResponse objects or result dicts,
+                e.g. from stream_batch_process_queries()
+            filename: Output file path
+            
+        Returns:
+            Number of results written
+        """
+        if orjson is not None:
+            def dumps(record: Dict[str, Any]) -> bytes:
+                return orjson.dumps(
+                    record,
+                    option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_PASSTHROUGH_DATETIME,
+                    default=str
+                )
+        else:
+            import json
+            
+            def dumps(record: Dict[str, Any]) -> bytes:
+                return (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        
+        count = 0
+        with open(filename, 'wb') as f:
+            async for result in results:
+                f.write(dumps(self._result_record(result)))
+                count += 1
+        
+        logger.info(f"Streamed {count} results to {filename}")
+        return count
+
 
+# Immutable, so the getters can hand out the same tuple every time
+_SAMPLE_QUERIES: Tuple[str, ...] = (
+    "Hello! Who are you and what can you help me with?",
+    "Tell me a funny programming joke.",
+    "What's the capital of France and one interesting fact about it?",
+    "Give me a brief summary of Python programming language.",
+    "What are the benefits of using AI agents?",
+    "Explain quantum computing in simple terms.",
+    "What's the weather like today?",
+    "Who won the latest Nobel Prize in Physics?",
+)
 
-def get_sample_queries() -> List[str]:
-    """Return a curated list of sample queries for testing."""
-    return [
-        "Hello! Who are you and what can you help me with?",
-        "Tell me a funny programming joke.",
-        "What's the capital of France and one interesting fact about it?",
-        "Give me a brief summary of Python programming language.",
-        "What are the benefits of using AI agents?",
-        "Explain quantum computing in simple terms.",
-        "What's the weather like today?",
-        "Who won the latest Nobel Prize in Physics?",
-    ]
+_CREATIVE_QUERIES: Tuple[str, ...] = (
+    "Write a short haiku about artificial intelligence",
+    "If you were a superhero, what would your power be and why?",
+    "Describe the future of human-computer interaction in 2050",
+    "What's the most interesting scientific discovery of the past decade?",
+    "Create a recipe for a dish that represents machine learning",
+)
 
 
-def get_creative_queries() -> List[str]:
+def get_sample_queries() -> Tuple[str, ...]:
+    """Return a curated set of sample queries for testing."""
+    return _SAMPLE_QUERIES
+
+
+def get_creative_queries() -> Tuple[str, ...]:
     """Return more creative and challenging queries."""
-    return [
-        "Write a short haiku about artificial intelligence",
-        "If you were a superhero, what would your power be and why?",
-        "Describe the future of human-computer interaction in 2050",
-        "What's the most interesting scientific discovery of the past decade?",
-        "Create a recipe for a dish that represents machine learning",
-    ]
+    return _CREATIVE_QUERIES
 
 
 async def interactive_mode(runner: AgentRunner):
@@ -272,11 +345,17 @@ async def interactive_mode(runner: AgentRunner):
     print("\n🎮 INTERACTIVE MODE")
     print("Type your questions (or 'quit' to exit):")
     
+    # Warm the default session while the user types the first question
+    warmup = asyncio.create_task(get_session_manager().get_session_and_runner())
+    # A failure here resurfaces on the first query; just mark it as retrieved
+    warmup.add_done_callback(lambda task: task.cancelled() or task.exception())
+    
     query_count = 0
     
     while True:
         try:
-            query = input("\n🤔 You: ").strip()
+            # Read in a worker thread so the event loop keeps running meanwhile
+            query = (await asyncio.to_thread(input, "\n🤔 You: ")).strip()
             
             if query.lower() in ['quit', 'exit', 'q']:
                 print("👋 Goodbye!")
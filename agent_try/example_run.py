@@ -6,35 +6,56 @@ and handles different types of responses and errors.
 """
 
 import asyncio
+import logging
 import time
-from typing import List, Dict, Any
+from typing import List, Optional, Sequence, Tuple
+from dataclasses import dataclass
 from datetime import datetime
-from agent_try.agent import root_agent, get_agent_response
+from agent_try.agent import (
+    RateLimiter, _configure_logging, get_agent_response, get_session_manager, run_async
+)
 import os
 
+logger = logging.getLogger("agent_try.runner")
+
+
+@dataclass(slots=True)
+class QueryResult:
+    """Outcome of a single query run."""
+    query: str
+    response: Optional[str]
+    processing_time: float
+    timestamp: datetime
+    success: bool
+    error: Optional[str]
+
 
 class AgentRunner:
     """A professional agent runner with logging, timing, and error handling."""
     
-    def __init__(self, agent_name: str = "basic_search_agent"):
+    __slots__ = ("agent_name", "session_service", "runner", "limiter")
+    
+    def __init__(self, agent_name: str = "basic_search_agent", max_rate: float = 5):
         self.agent_name = agent_name
         self.session_service = None
         self.runner = None
+        # Shared across batches so back-to-back runs stay within API limits
+        self.limiter = RateLimiter(max_rate, 1.0)
+        _configure_logging()
         
     async def initialize(self):
         """Initialize the agent session and runner."""
         try:
-            from agent_try.agent import session_manager
-            session, runner = await session_manager.get_session_and_runner()
+            session, runner = await get_session_manager().get_session_and_runner()
             self.session_service = runner.session_service
             self.runner = runner
-            print(f"✅ Agent '{self.agent_name}' initialized successfully")
+            logger.info("Agent '%s' initialized successfully", self.agent_name)
             return True
         except Exception as e:
-            print(f"❌ Failed to initialize agent: {e}")
+            logger.error("Failed to initialize agent: %s", e)
             return False
     
-    async def run_query(self, query: str, query_id: int = None) -> Dict[str, Any]:
+    async def run_query(self, query: str, query_id: int = None) -> QueryResult:
         """
         Run a single query through the agent with comprehensive logging.
         
@@ -43,123 +64,146 @@ class AgentRunner:
             query_id: Optional ID for tracking multiple queries
             
         Returns:
-            Dictionary containing response data and metadata
+            QueryResult with the response and timing data
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
+        # One clock read per query, shared by the log line and the result
+        timestamp = datetime.now()
         
         try:
-            print(f"\n{'='*60}")
-            if query_id:
-                print(f"QUERY #{query_id}: {query}")
-            else:
-                print(f"QUERY: {query}")
-            print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"{'='*60}")
+            if logger.isEnabledFor(logging.INFO):
+                if query_id:
+                    logger.info("QUERY #%d: %s", query_id, query)
+                else:
+                    logger.info("QUERY: %s", query)
+                logger.info("Timestamp: %s", timestamp.strftime('%Y-%m-%d %H:%M:%S'))
             
             # Get agent response using the helper function
             response = await get_agent_response(query)
             
-            end_time = time.time()
+            end_time = time.perf_counter()
             processing_time = end_time - start_time
             
-            result = {
-                "query": query,
-                "response": response,
-                "processing_time": processing_time,
-                "timestamp": datetime.now(),
-                "success": True,
-                "error": None
-            }
+            result = QueryResult(
+                query=query,
+                response=response,
+                processing_time=processing_time,
+                timestamp=timestamp,
+                success=True,
+                error=None
+            )
             
-            print(f"🔄 Processing time: {processing_time:.2f}s")
-            print(f"📝 Response: {response}")
+            logger.info("Processing time: %.2fs", processing_time)
+            logger.info("Response: %s", response)
             
             return result
             
         except Exception as e:
-            end_time = time.time()
+            end_time = time.perf_counter()
             processing_time = end_time - start_time
             
-            result = {
-                "query": query,
-                "response": None,
-                "processing_time": processing_time,
-                "timestamp": datetime.now(),
-                "success": False,
-                "error": str(e)
-            }
+            result = QueryResult(
+                query=query,
+                response=None,
+                processing_time=processing_time,
+                timestamp=timestamp,
+                success=False,
+                error=str(e)
+            )
             
-            print(f"❌ Error after {processing_time:.2f}s: {e}")
+            logger.error("Error after %.2fs: %s", processing_time, e)
             return result
     
-    async def run_batch_queries(self, queries: List[str]) -> List[Dict[str, Any]]:
+    async def run_batch_queries(
+        self, queries: Sequence[str], max_concurrency: int = 8
+    ) -> List[QueryResult]:
         """
-        Run multiple queries in sequence and collect results.
+        Run multiple queries concurrently, logging each result as it completes.
         
         Args:
             queries: List of queries to process
+            max_concurrency: Maximum number of queries in flight at once;
+                starts are additionally paced by the rate limiter
             
         Returns:
-            List of result dictionaries for each query
+            List of QueryResult for each query, in input order
         """
-        print(f"\n🎯 Starting batch processing of {len(queries)} queries")
-        print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info("Starting batch processing of %d queries", len(queries))
+            logger.info("Start time: %s", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
         
-        results = []
-        total_start_time = time.time()
+        total_start_time = time.perf_counter()
+        results: List[Optional[QueryResult]] = [None] * len(queries)
+        successful = 0
+        sem = asyncio.Semaphore(max_concurrency)
         
-        for i, query in enumerate(queries, 1):
-            result = await self.run_query(query, query_id=i)
-            results.append(result)
-            
-            # Small delay between queries to be respectful of API limits
-            if i < len(queries):
-                await asyncio.sleep(1)
+        async def _one(i: int, query: str) -> Tuple[int, QueryResult]:
+            async with sem:
+                async with self.limiter:
+                    return i, await self.run_query(query, query_id=i)
+        
+        tasks = [asyncio.create_task(_one(i, query)) for i, query in enumerate(queries, 1)]
+        try:
+            for completed, next_result in enumerate(asyncio.as_completed(tasks), 1):
+                i, result = await next_result
+                # Fill the result's slot and count it as it arrives, so the
+                # summary needs no extra pass
+                results[i - 1] = result
+                successful += result.success
+                logger.info("Completed %d/%d (query #%d)", completed, len(queries), i)
+        finally:
+            # Don't leave queries running if the batch is cancelled
+            for task in tasks:
+                task.cancel()
         
-        total_end_time = time.time()
+        total_end_time = time.perf_counter()
         total_time = total_end_time - total_start_time
         
         # Generate summary
-        successful = sum(1 for r in results if r['success'])
         failed = len(queries) - successful
         avg_time = total_time / len(queries)
         
-        print(f"\n{'='*60}")
-        print("📊 BATCH PROCESSING SUMMARY")
-        print(f"{'='*60}")
-        print(f"Total queries: {len(queries)}")
-        print(f"✅ Successful: {successful}")
-        print(f"❌ Failed: {failed}")
-        print(f"⏱️ Total time: {total_time:.2f}s")
-        print(f"📈 Average time per query: {avg_time:.2f}s")
-        print(f"End time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info(
+            "Batch processing summary: %d queries, %d successful, %d failed, "
+            "%.2fs total, %.2fs average per query",
+            len(queries), successful, failed, total_time, avg_time
+        )
+        if log_info:
+            logger.info("End time: %s", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
         
         return results
 
 
-def get_sample_queries() -> List[str]:
-    """Return a curated list of sample queries for testing."""
-    return [
-        "Hello! Who are you and what can you help me with?",
-        "Tell me a funny programming joke.",
-        "What's the capital of France and one interesting fact about it?",
-        "Give me a brief summary of Python programming language.",
-        "What are the benefits of using AI agents?",
-        "Explain quantum computing in simple terms.",
-        "What's the weather like today?",
-        "Who won the latest Nobel Prize in Physics?",
-    ]
+# Immutable, so the getters can hand out the same tuple every time
+_SAMPLE_QUERIES: Tuple[str, ...] = (
+    "Hello! Who are you and what can you help me with?",
+    "Tell me a funny programming joke.",
+    "What's the capital of France and one interesting fact about it?",
+    "Give me a brief summary of Python programming language.",
+    "What are the benefits of using AI agents?",
+    "Explain quantum computing in simple terms.",
+    "What's the weather like today?",
+    "Who won the latest Nobel Prize in Physics?",
+)
+
+_CREATIVE_QUERIES: Tuple[str, ...] = (
+    "Write a short haiku about artificial intelligence",
+    "If you were a superhero, what would your power be and why?",
+    "Describe the future of human-computer interaction in 2050",
+    "What's the most interesting scientific discovery of the past decade?",
+    "Create a recipe for a dish that represents machine learning",
+)
+
+
+def get_sample_queries() -> Tuple[str, ...]:
+    """Return a curated set of sample queries for testing."""
+    return _SAMPLE_QUERIES
 
 
-def get_creative_queries() -> List[str]:
+def get_creative_queries() -> Tuple[str, ...]:
     """Return more creative and challenging queries."""
-    return [
-        "Write a short haiku about artificial intelligence",
-        "If you were a superhero, what would your power be and why?",
-        "Describe the future of human-computer interaction in 2050",
-        "What's the most interesting scientific discovery of the past decade?",
-        "Create a recipe for a dish that represents machine learning",
-    ]
+    return _CREATIVE_QUERIES
 
 
 async def interactive_mode(runner: AgentRunner):
@@ -167,9 +211,15 @@ async def interactive_mode(runner: AgentRunner):
     print("\n🎮 INTERACTIVE MODE")
     print("Type your questions (or 'quit' to exit):")
     
+    # Warm the default session while the user types the first question
+    warmup = asyncio.create_task(get_session_manager().get_session_and_runner())
+    # A failure here resurfaces on the first query; just mark it as retrieved
+    warmup.add_done_callback(lambda task: task.cancelled() or task.exception())
+    
     while True:
         try:
-            query = input("\n🤔 You: ").strip()
+            # Read in a worker thread so the event loop keeps running meanwhile
+            query = (await asyncio.to_thread(input, "\n🤔 You: ")).strip()
             
             if query.lower() in ['quit', 'exit', 'q']:
                 print("👋 Goodbye!")
@@ -178,7 +228,13 @@ async def interactive_mode(runner: AgentRunner):
             if not query:
                 continue
                 
-            await runner.run_query(query)
+            result = await runner.run_query(query)
+            
+            if result.success:
+                print(f"🤖 Agent: {result.response}")
+                print(f"⏱️ Time: {result.processing_time:.2f}s")
+            else:
+                print(f"❌ Error: {result.error}")
             
         except KeyboardInterrupt:
             print("\n👋 Interrupted by user. Goodbye!")
@@ -233,5 +289,5 @@ if __name__ == "__main__":
     if os.name == 'nt':
         asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
     
-    # Run the main function
-    asyncio.run(main())
\ No newline at end of file
+    # Run the main function (on uvloop when installed)
+    run_async(main())
\ No newline at end of file
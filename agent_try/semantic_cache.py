@@ -0,0 +1,125 @@
+"""
+Semantic response cache for the Google ADK AI Agent.
+
+Caches responses by prompt embedding so that paraphrased queries ("What's the
+capital of France?" / "Tell me France's capital") can be answered without a
+model call. Requires numpy; install it with ``pip install ".[semantic]"``.
+"""
+
+import time
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency; the semantic cache is disabled without it
+    np = None
+
+
+class SemanticCache:
+    """
+    Bounded FIFO cache of (embedding, response) pairs matched by cosine similarity.
+
+    Embeddings are stored L2-normalized in one contiguous float32 matrix, so a
+    lookup is a single matrix-vector product over the live rows. Entries are
+    scoped (e.g. per user and session) so answers never cross conversations.
+    """
+
+    def __init__(self, threshold: float = 0.92, capacity: int = 512, ttl: float = 3600):
+        if np is None:
+            raise ImportError("SemanticCache requires numpy; install it with pip install numpy")
+
+        self.threshold = threshold
+        self.capacity = capacity
+        self.ttl = ttl
+        # Allocated on first insert, once the embedding dimension is known
+        self._embeddings: Optional["np.ndarray"] = None
+        self._stored_at = np.zeros(capacity, dtype=np.float64)
+        self._scopes = np.empty(capacity, dtype=object)
+        self._responses = [None] * capacity
+        self._count = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def _normalize(embedding) -> "np.ndarray":
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, embedding, scope: str = "") -> Optional[str]:
+        """
+        Return the cached response closest to embedding, if similar enough.
+
+        Args:
+            embedding: Prompt embedding vector
+            scope: Only entries inserted with the same scope can match
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        if self._count == 0:
+            return None
+
+        scores = self._embeddings[:self._count] @ self._normalize(embedding)
+        scores[self._unusable(scope)] = -np.inf
+
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            return self._responses[best]
+        return None
+
+    def lookup_many(self, embeddings, scope: str = "") -> List[Optional[str]]:
+        """
+        Look up several prompts at once with a single matrix-matrix product.
+
+        Args:
+            embeddings: Sequence of prompt embedding vectors, one per prompt
+            scope: Only entries inserted with the same scope can match
+
+        Returns:
+            The cached response or None for each prompt, in input order
+        """
+        if self._count == 0 or len(embeddings) == 0:
+            return [None] * len(embeddings)
+
+        queries = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        scores = (queries / norms) @ self._embeddings[:self._count].T
+        scores[:, self._unusable(scope)] = -np.inf
+
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(best)), best]
+        return [
+            self._responses[index] if score >= self.threshold else None
+            for index, score in zip(best.tolist(), best_scores.tolist())
+        ]
+
+    def _unusable(self, scope: str) -> "np.ndarray":
+        """Mask of live entries that are expired or belong to another scope."""
+        n = self._count
+        return (time.monotonic() - self._stored_at[:n] >= self.ttl) | (self._scopes[:n] != scope)
+
+    def insert(self, embedding, response: str, scope: str = "") -> None:
+        """
+        Add a response, overwriting the oldest entry once the cache is full.
+
+        Args:
+            embedding: Prompt embedding vector
+            response: Response text to return for similar prompts
+            scope: Scope the entry is visible in
+        """
+        vector = self._normalize(embedding)
+        if self._embeddings is None:
+            self._embeddings = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+
+        slot = self._next
+        self._embeddings[slot] = vector
+        self._stored_at[slot] = time.monotonic()
+        self._scopes[slot] = scope
+        self._responses[slot] = response
+
+        self._next = (slot + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
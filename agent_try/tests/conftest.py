@@ -0,0 +1,48 @@
+"""
+Shared fixtures for the agent test suite.
+"""
+
+from contextlib import aclosing
+
+import pytest_asyncio
+
+from agent_try._replay import replayable
+from agent_try.agent import _build_user_content, get_session_manager
+
+
+@replayable
+async def _run_on_runner(query: str, runner, session) -> str:
+    """Run a query on a runner and return the final response text."""
+    async with aclosing(runner.run_async(
+        user_id=session.user_id,
+        session_id=session.id,
+        new_message=_build_user_content(query)
+    )) as events:
+        async for event in events:
+            if event.is_final_response():
+                return (event.content.parts[0].text or "").strip()
+    return ""
+
+
+class WarmAgent:
+    """Test helper bound to a default session created before the first test."""
+
+    def __init__(self, session, runner):
+        self.session = session
+        self.runner = runner
+
+    async def ask(self, query: str) -> str:
+        """
+        Send a query straight through the warm runner.
+
+        This skips get_agent_response and its response caches, so every call
+        is a real model round-trip (unless AGENT_REPLAY serves it).
+        """
+        return await _run_on_runner(query, self.runner, self.session)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def warm_runner():
+    """Create the default session and runner once for the whole suite."""
+    session, runner = await get_session_manager().get_session_and_runner()
+    return WarmAgent(session, runner)
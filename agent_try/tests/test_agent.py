@@ -20,6 +20,14 @@ def test_agent_validation():
     # Test query with forbidden patterns
     with pytest.raises(ValidationError):
         validate_query("<script>alert('xss')</script>")
+    
+    # Forbidden patterns are matched regardless of case
+    with pytest.raises(ValidationError, match="forbidden pattern: javascript:"):
+        validate_query("Open JavaScript:alert(1) please")
+    
+    # Length limits are checked before the pattern scan
+    with pytest.raises(ValidationError, match="too long"):
+        validate_query("<script>" + "x" * 2001)
 
 
 def test_agent_info():
@@ -33,6 +41,17 @@ def test_agent_info():
     assert info["model"] == "gemini-2.5-flash-lite"
 
 
+def test_agent_info_returns_copies():
+    """Test mutating returned info doesn't leak into later calls."""
+    info = get_agent_info()
+    info["config"]["max_retries"] = -1
+    info["available_tools"].append("FakeTool")
+    
+    fresh = get_agent_info()
+    assert fresh["config"]["max_retries"] != -1
+    assert "FakeTool" not in fresh["available_tools"]
+
+
 def test_agent_config():
     """Test agent configuration."""
     from agent_try.agent import config
@@ -43,43 +62,22 @@ def test_agent_config():
     assert config.app_name == "professional_search_agent"
 
 
-def test_agent_response_type():
-    """Test if the agent returns a string response."""
-    from agent_try.agent import get_agent_response
-    
-    query = "Hello, who are you?"
-    response = asyncio.run(get_agent_response(query))
+@pytest.mark.parametrize("query", [
+    "Hello, who are you?",
+    "Tell me a joke.",
+    "What is Python?",
+    "Explain artificial intelligence",
+    "What's the weather like?",
+])
+@pytest.mark.asyncio(loop_scope="session")
+async def test_agent_response(warm_runner, query):
+    """Test the agent returns a meaningful string response for various queries."""
+    response = await warm_runner.ask(query)
     assert isinstance(response, str), "Agent response should be a string"
-    assert len(response) > 0, "Agent response should not be empty"
-
-
-def test_agent_non_empty_response():
-    """Test if the agent returns a non-empty response."""
-    from agent_try.agent import get_agent_response
-    
-    query = "Tell me a joke."
-    response = asyncio.run(get_agent_response(query))
     assert response.strip() != "", "Agent response should not be empty"
     assert len(response) > 10, "Agent response should be meaningful"
 
 
-def test_agent_with_different_queries():
-    """Test agent with various query types."""
-    from agent_try.agent import get_agent_response
-    
-    test_queries = [
-        "What is Python?",
-        "Explain artificial intelligence",
-        "What's the weather like?",
-    ]
-    
-    for query in test_queries:
-        response = asyncio.run(get_agent_response(query))
-        assert isinstance(response, str)
-        assert len(response) > 0
-        print(f"Query: '{query}' -> Response length: {len(response)}")
-
-
 def test_agent_error_handling():
     """Test agent error handling for invalid inputs."""
     from agent_try.agent import get_agent_response, ValidationError
@@ -90,4 +88,589 @@ def test_agent_error_handling():
     
     # Test very short query  
     with pytest.raises(ValidationError):
-        asyncio.run(get_agent_response("a"))
\ No newline at end of file
+        asyncio.run(get_agent_response("a"))
+
+def test_batch_process_queries_concurrent(monkeypatch):
+    """Test batch processing overlaps requests and preserves input order."""
+    from agent_try import agent
+    
+    in_flight = 0
+    peak = 0
+    
+    async def fake_get_agent_response(query, user_id=None, session_id=None, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return f"echo: {query}"
+    
+    monkeypatch.setattr(agent, "_get_agent_response_unchecked", fake_get_agent_response)
+    
+    queries = ["What is Python?", "", "Tell me a joke", "Explain AI"]
+    results = asyncio.run(agent.batch_process_queries(queries))
+    
+    assert [r["query_id"] for r in results] == [1, 2, 3, 4]
+    assert [r["status"] for r in results] == ["success", "error", "success", "success"]
+    assert results[0]["response"] == "echo: What is Python?"
+    assert peak > 1
+
+
+def test_session_manager_concurrent_creation():
+    """Test concurrent requests for one session build a single runner."""
+    from agent_try.agent import SessionManager, load_config
+    
+    async def get_concurrently():
+        manager = SessionManager(load_config())
+        results = await asyncio.gather(*[
+            manager.get_session_and_runner("race_user", "race_session")
+            for _ in range(5)
+        ])
+        return manager, results
+    
+    manager, results = asyncio.run(get_concurrently())
+    
+    assert manager.get_active_sessions_count() == 1
+    assert all(runner is results[0][1] for _, runner in results)
+
+
+class _FakeEvent:
+    """Minimal stand-in for an ADK event."""
+    
+    def __init__(self, text, final, partial=False):
+        part = type("Part", (), {"text": text})()
+        self.content = type("Content", (), {"parts": [part]})()
+        self.partial = partial
+        self._final = final
+    
+    def is_final_response(self):
+        return self._final
+
+
+class _FakeRunner:
+    """Runner stub that replays a fixed list of events."""
+    
+    def __init__(self, events):
+        self.events = events
+        self.closed = False
+    
+    async def run_async(self, **kwargs):
+        try:
+            for event in self.events:
+                yield event
+        finally:
+            self.closed = True
+
+
+def test_get_agent_response_final_event(monkeypatch):
+    """Test the final response is returned and the event stream is closed."""
+    from agent_try import agent
+    
+    runner = _FakeRunner([
+        _FakeEvent("thinking", final=False),
+        _FakeEvent("  Paris is the capital of France.  ", final=True),
+        _FakeEvent("ignored", final=True),
+    ])
+    
+    async def fake_get_session_and_runner(user_id=None, session_id=None):
+        return None, runner
+    
+    monkeypatch.setattr(
+        agent.get_session_manager(), "get_session_and_runner", fake_get_session_and_runner
+    )
+    
+    response = asyncio.run(agent.get_agent_response("What is the capital of France?"))
+    
+    assert response == "Paris is the capital of France."
+    assert runner.closed
+
+
+def test_request_coalescer():
+    """Test coalesced requests each get their own result or error."""
+    from agent_try.agent import RequestCoalescer
+    
+    async def handler(query):
+        if query == "fail":
+            raise ValueError("boom")
+        return query.upper()
+    
+    async def submit_all():
+        coalescer = RequestCoalescer(handler, flush_ms=5, max_batch=4)
+        return await asyncio.gather(
+            *[coalescer.submit(q) for q in ["a", "b", "fail", "c", "d", "e"]],
+            return_exceptions=True
+        )
+    
+    results = asyncio.run(submit_all())
+    
+    assert results[:2] == ["A", "B"]
+    assert isinstance(results[2], ValueError)
+    assert results[3:] == ["C", "D", "E"]
+
+
+def test_coalescers_are_dropped_with_their_loop(monkeypatch):
+    """Test an idle coalescer doesn't keep its finished event loop alive."""
+    import gc
+    from agent_try import agent
+    
+    async def fake_run_agent_query(query, user_id, session_id, max_retries):
+        return query
+    
+    monkeypatch.setattr(agent, "_run_agent_query", fake_run_agent_query)
+    
+    async def submit_once():
+        return await agent._get_coalescer().submit("q", None, None, None)
+    
+    for _ in range(3):
+        assert asyncio.run(submit_once()) == "q"
+    gc.collect()
+    
+    assert len(agent._coalescers) == 0
+
+
+def test_http_pools_are_closed_with_their_loop():
+    """Test a pool with open keep-alive connections doesn't outlive run_async."""
+    import gc
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from google.genai import types
+    from agent_try import agent
+    
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+    
+    async def request_once():
+        api_client = agent._get_genai_client(types.HttpOptions())._api_client
+        response = await api_client._async_httpx_client.get(url)
+        return response.text
+    
+    try:
+        for _ in range(3):
+            assert agent.run_async(request_once()) == "ok"
+    finally:
+        server.shutdown()
+        server.server_close()
+    gc.collect()
+    
+    assert len(agent._http_clients) == 0
+
+
+def test_stream_agent_response_chunks(monkeypatch):
+    """Test partial chunks are streamed without repeating the final text."""
+    from agent_try import agent
+    
+    runner = _FakeRunner([
+        _FakeEvent("Paris is ", final=False, partial=True),
+        _FakeEvent("the capital.", final=False, partial=True),
+        _FakeEvent("Paris is the capital.", final=True),
+    ])
+    
+    async def fake_get_session_and_runner(user_id=None, session_id=None):
+        return None, runner
+    
+    monkeypatch.setattr(
+        agent.get_session_manager(), "get_session_and_runner", fake_get_session_and_runner
+    )
+    
+    async def collect():
+        return [chunk async for chunk in agent.stream_agent_response("Capital of France?")]
+    
+    assert asyncio.run(collect()) == ["Paris is ", "the capital."]
+    assert runner.closed
+
+
+def test_session_manager_lru_eviction():
+    """Test the least recently used session is evicted at capacity."""
+    from dataclasses import replace
+    from agent_try.agent import SessionManager, load_config
+    
+    async def fill():
+        manager = SessionManager(replace(load_config(), max_sessions=2))
+        await manager.get_session_and_runner("lru_user", "s1")
+        await manager.get_session_and_runner("lru_user", "s2")
+        await manager.get_session_and_runner("lru_user", "s1")  # s2 is now oldest
+        await manager.get_session_and_runner("lru_user", "s3")
+        await asyncio.gather(*manager._releases.values())
+        return manager
+    
+    manager = asyncio.run(fill())
+    
+    assert manager.get_active_sessions_count() == 2
+    assert list(manager._sessions) == [("lru_user", "s1"), ("lru_user", "s3")]
+
+
+def test_session_manager_recreates_evicted_session():
+    """Test an evicted key can be requested again before its release runs."""
+    from dataclasses import replace
+    from agent_try.agent import SessionManager, load_config
+    
+    async def churn():
+        manager = SessionManager(replace(load_config(), max_sessions=1))
+        await manager.get_session_and_runner("evict_user", "s1")
+        await manager.get_session_and_runner("evict_user", "s2")
+        # s1's release is still pending here
+        session, _ = await manager.get_session_and_runner("evict_user", "s1")
+        await asyncio.gather(*manager._releases.values())
+        stored = await manager.session_service.get_session(
+            app_name=manager.config.app_name, user_id="evict_user", session_id="s1"
+        )
+        return session, stored
+    
+    session, stored = asyncio.run(churn())
+    
+    assert session.id == "s1"
+    # The stale delete must not have removed the recreated session's state
+    assert stored is not None
+
+
+def test_session_manager_keeps_at_least_one_session(monkeypatch):
+    """Test max_sessions=0 still keeps the new session and never closes runners."""
+    from dataclasses import replace
+    from google.adk.runners import Runner
+    from agent_try.agent import SessionManager, load_config
+    
+    closed = []
+    
+    async def record_close(runner):
+        closed.append(runner)
+    
+    # Closing a runner would close toolsets on the agent every session shares
+    monkeypatch.setattr(Runner, "close", record_close)
+    
+    async def churn():
+        manager = SessionManager(replace(load_config(), max_sessions=0))
+        await manager.get_session_and_runner("tiny_user", "s1")
+        session, _ = await manager.get_session_and_runner("tiny_user", "s2")
+        await asyncio.gather(*manager._releases.values())
+        stored = await manager.session_service.get_session(
+            app_name=manager.config.app_name, user_id="tiny_user", session_id="s2"
+        )
+        return manager, stored
+    
+    manager, stored = asyncio.run(churn())
+    
+    assert list(manager._sessions) == [("tiny_user", "s2")]
+    assert stored is not None
+    assert closed == []
+
+
+def test_stream_batch_process_queries_to_file(monkeypatch, tmp_path):
+    """Test streamed batch results can be written out as NDJSON."""
+    import json
+    from agent_try import agent
+    from agent_try.agent_runner import AgentRunner
+    
+    async def fake_get_agent_response(query, user_id=None, session_id=None, **kwargs):
+        await asyncio.sleep(0.02 if query == "What is Python?" else 0)
+        return f"echo: {query}"
+    
+    monkeypatch.setattr(agent, "_get_agent_response_unchecked", fake_get_agent_response)
+    
+    output = tmp_path / "results.ndjson"
+    stream = agent.stream_batch_process_queries(["What is Python?", "Tell me a joke"])
+    count = asyncio.run(AgentRunner().stream_results_to_file(stream, str(output)))
+    
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert count == 2
+    # The slower first query completes last
+    assert [r["query_id"] for r in records] == [2, 1]
+
+
+def test_get_agent_response_fails_fast_on_programming_errors(monkeypatch):
+    """Test non-transient errors are not retried."""
+    from agent_try import agent
+    
+    calls = 0
+    
+    async def broken_get_session_and_runner(user_id=None, session_id=None):
+        nonlocal calls
+        calls += 1
+        raise TypeError("unexpected SDK change")
+    
+    monkeypatch.setattr(
+        agent.get_session_manager(), "get_session_and_runner", broken_get_session_and_runner
+    )
+    
+    with pytest.raises(agent.AgentError):
+        asyncio.run(agent.get_agent_response("What is Python?", max_retries=3))
+    
+    assert calls == 1
+
+
+def test_response_cache_dedupes_identical_queries(monkeypatch):
+    """Test identical concurrent and repeated queries reach the model once."""
+    from agent_try import agent
+    
+    calls = 0
+    
+    async def fake_run_agent_query(query, user_id, session_id, max_retries):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return f"answer to {query}"
+    
+    monkeypatch.setattr(agent, "_run_agent_query", fake_run_agent_query)
+    cache = agent.ResponseCache(max_size=8, ttl_s=60)
+    monkeypatch.setattr(agent, "_get_response_cache", lambda: cache)
+    
+    async def ask_twice():
+        first = await asyncio.gather(
+            *[agent.get_agent_response("What is caching?") for _ in range(3)]
+        )
+        second = await agent.get_agent_response("What is caching?")
+        return first, second
+    
+    first, second = asyncio.run(ask_twice())
+    
+    assert first == ["answer to What is caching?"] * 3
+    assert second == "answer to What is caching?"
+    assert calls == 1
+
+
+def test_semantic_cache_lookup():
+    """Test similar embeddings hit, dissimilar, other-scope and full-FIFO ones miss."""
+    pytest.importorskip("numpy")
+    from agent_try.semantic_cache import SemanticCache
+    
+    cache = SemanticCache(threshold=0.9, capacity=2)
+    cache.insert([1.0, 0.0, 0.0], "france", scope="alice")
+    
+    assert cache.lookup([0.98, 0.05, 0.0], scope="alice") == "france"
+    assert cache.lookup([0.0, 1.0, 0.0], scope="alice") is None
+    assert cache.lookup([1.0, 0.0, 0.0], scope="bob") is None
+    
+    cache.insert([0.0, 1.0, 0.0], "germany", scope="alice")
+    cache.insert([0.0, 0.0, 1.0], "spain", scope="alice")
+    
+    assert len(cache) == 2
+    assert cache.lookup([1.0, 0.0, 0.0], scope="alice") is None
+    assert cache.lookup([0.0, 0.1, 1.0], scope="alice") == "spain"
+
+
+def test_batch_semantic_cache_embeds_once(monkeypatch):
+    """Test a batch embeds all queries in one call and skips the model on hits."""
+    pytest.importorskip("numpy")
+    from agent_try import agent
+    from agent_try.semantic_cache import SemanticCache
+    
+    config = agent.load_config()
+    scope = f"{config.user_id}\x00{config.session_id}"
+    cache = SemanticCache(threshold=0.9)
+    cache.insert([1.0, 0.0], "Paris", scope=scope)
+    
+    embed_calls = []
+    model_calls = []
+    
+    async def fake_embed_texts(texts):
+        embed_calls.append(texts)
+        return [[1.0, 0.05] if "France" in text else [0.0, 1.0] for text in texts]
+    
+    async def fake_run_agent_query(query, user_id, session_id, max_retries):
+        model_calls.append(query)
+        return "Berlin"
+    
+    monkeypatch.setattr(agent, "_get_semantic_cache", lambda: cache)
+    monkeypatch.setattr(agent, "_get_response_cache", lambda: agent.ResponseCache(8, 60))
+    monkeypatch.setattr(agent, "_embed_texts", fake_embed_texts)
+    monkeypatch.setattr(agent, "_run_agent_query", fake_run_agent_query)
+    
+    results = asyncio.run(agent.batch_process_queries([
+        "Tell me France's capital",
+        "Capital of Germany?",
+    ]))
+    
+    assert [r["response"] for r in results] == ["Paris", "Berlin"]
+    assert len(embed_calls) == 1
+    assert model_calls == ["Capital of Germany?"]
+    assert len(cache) == 2
+
+
+def test_rate_limiter_allows_burst_then_throttles():
+    """Test the token bucket admits a full burst and then waits for refills."""
+    from agent_try.agent import RateLimiter
+    
+    async def acquire_times():
+        limiter = RateLimiter(2, 0.2)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        times = []
+        for _ in range(3):
+            async with limiter:
+                times.append(loop.time() - start)
+        return times
+    
+    times = asyncio.run(acquire_times())
+    
+    assert times[1] < 0.05
+    assert times[2] >= 0.08
+
+
+def test_rate_limiter_fractional_rate():
+    """Test a rate below one per period still hands out tokens."""
+    from agent_try.agent import RateLimiter
+    
+    async def acquire_twice():
+        limiter = RateLimiter(0.5, 0.1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.wait_for(limiter.acquire(), 1)
+        first = loop.time() - start
+        await asyncio.wait_for(limiter.acquire(), 1)
+        return first, loop.time() - start
+    
+    first, second = asyncio.run(acquire_twice())
+    
+    assert first < 0.05
+    assert second >= 0.15
+
+
+def test_replay_records_then_serves_responses(monkeypatch, tmp_path):
+    """Test AGENT_RECORD writes a cassette that AGENT_REPLAY answers from."""
+    from agent_try import agent
+    from agent_try._replay import _replay_mode, load_cassette
+    
+    cassette = tmp_path / "cassette.json"
+    monkeypatch.setenv("AGENT_CASSETTE", str(cassette))
+    
+    async def live_run_agent_query(query, user_id, session_id, max_retries):
+        if query == "What is a fallback?":
+            return agent._EMPTY_RESPONSE_MESSAGE
+        return "recorded answer"
+    
+    monkeypatch.setattr(agent, "_run_agent_query", live_run_agent_query)
+    monkeypatch.setenv("AGENT_RECORD", "1")
+    _replay_mode.cache_clear()
+    try:
+        assert asyncio.run(agent.get_agent_response("What is replay?")) == "recorded answer"
+        # Fallback answers are returned but never recorded
+        assert asyncio.run(agent.get_agent_response("What is a fallback?")) == agent._EMPTY_RESPONSE_MESSAGE
+        assert list(load_cassette(cassette).values()) == ["recorded answer"]
+        
+        async def offline_run_agent_query(query, user_id, session_id, max_retries):
+            raise AssertionError("replay should not reach the agent")
+        
+        monkeypatch.setattr(agent, "_run_agent_query", offline_run_agent_query)
+        monkeypatch.delenv("AGENT_RECORD")
+        monkeypatch.setenv("AGENT_REPLAY", "1")
+        _replay_mode.cache_clear()
+        assert asyncio.run(agent.get_agent_response("What is replay?")) == "recorded answer"
+    finally:
+        _replay_mode.cache_clear()
+
+
+def test_deep_health_check_bypasses_response_cache(monkeypatch):
+    """Test each deep health check reaches the model even with caching on."""
+    from agent_try import agent
+    
+    calls = 0
+    
+    async def flaky_run_agent_query(query, user_id, session_id, max_retries):
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            raise agent.AgentError("API down")
+        return "I'm working"
+    
+    cache = agent.ResponseCache(max_size=8, ttl_s=60)
+    monkeypatch.setattr(agent, "_get_response_cache", lambda: cache)
+    monkeypatch.setattr(agent, "_run_agent_query", flaky_run_agent_query)
+    
+    async def check_twice():
+        return await agent.health_check(deep=True), await agent.health_check(deep=True)
+    
+    first, second = asyncio.run(check_twice())
+    
+    assert first["status"] == "healthy"
+    assert second["status"] == "unhealthy"
+    assert calls == 2
+
+
+def test_stream_batch_starts_model_calls_before_yielding_hits(monkeypatch):
+    """Test a slow consumer of cache hits doesn't delay the model calls."""
+    pytest.importorskip("numpy")
+    from agent_try import agent
+    from agent_try.semantic_cache import SemanticCache
+    
+    config = agent.load_config()
+    cache = SemanticCache(threshold=0.9)
+    cache.insert([1.0, 0.0], "Paris", scope=f"{config.user_id}\x00{config.session_id}")
+    model_calls = []
+    
+    async def fake_embed_texts(texts):
+        return [[1.0, 0.05] if "France" in text else [0.0, 1.0] for text in texts]
+    
+    async def fake_run_agent_query(query, user_id, session_id, max_retries):
+        model_calls.append(query)
+        await asyncio.sleep(0.01)
+        return "Berlin"
+    
+    monkeypatch.setattr(agent, "_get_semantic_cache", lambda: cache)
+    monkeypatch.setattr(agent, "_embed_texts", fake_embed_texts)
+    monkeypatch.setattr(agent, "_run_agent_query", fake_run_agent_query)
+    
+    async def consume_slowly():
+        stream = agent.stream_batch_process_queries(["Tell me France's capital", "Capital of Germany?"])
+        first = await anext(stream)
+        # Simulate slow handling of the hit; the miss should already be running
+        await asyncio.sleep(0.005)
+        started = list(model_calls)
+        rest = [result async for result in stream]
+        return first, started, rest
+    
+    first, started, rest = asyncio.run(consume_slowly())
+    
+    assert first["response"] == "Paris"
+    assert started == ["Capital of Germany?"]
+    assert [r["response"] for r in rest] == ["Berlin"]
+
+
+def test_genai_clients_share_pool_but_not_options():
+    """Test each option set gets its own Client over the loop's shared pool."""
+    from google.genai import types
+    from agent_try import agent
+    
+    async def build_clients():
+        # Embedding-style client first, as with the semantic cache enabled
+        plain = agent._get_genai_client(types.HttpOptions())
+        model = agent.PooledGemini(model=agent.load_config().model_name)
+        pooled_model_client = model.api_client
+        same = model.api_client
+        await agent.close_http_client()
+        return plain, pooled_model_client, same
+    
+    plain, model_client, same = asyncio.run(build_clients())
+    
+    assert model_client is same
+    assert model_client is not plain
+    assert "google-adk" in model_client._api_client._http_options.headers["x-goog-api-client"]
+    assert model_client._api_client._async_httpx_client is plain._api_client._async_httpx_client
+
+
+def test_warm_runner_bypasses_response_cache(monkeypatch):
+    """Test the live-test helper drives its runner directly, not the caches."""
+    from agent_try import agent
+    from agent_try.tests.conftest import WarmAgent
+    
+    runner = _FakeRunner([_FakeEvent(" Paris ", final=True)])
+    session = type("Session", (), {"user_id": "u", "id": "s"})()
+    
+    def no_cache():
+        raise AssertionError("warm_runner should not consult the response cache")
+    
+    monkeypatch.setattr(agent, "_get_response_cache", no_cache)
+    
+    assert asyncio.run(WarmAgent(session, runner).ask("Capital of France?")) == "Paris"
+    assert runner.closed